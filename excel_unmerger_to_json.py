@@ -1,98 +1,246 @@
+import numpy as np
 import pandas as pd
+import contextlib
+import io
 import json
 import openpyxl
-from openpyxl import load_workbook
+from openpyxl import load_workbook, Workbook
+from pandas.io.parsers import TextParser
 import os
+import re
+from pathlib import Path
 import sys
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import fast_json
+
+# python-calamine (Rust) reads xlsx much faster than openpyxl when installed
+try:
+    import python_calamine
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+def cell_value(value):
+    """Convert a cell value the way read_excel's openpyxl reader does"""
+    if value is None:
+        return ""
+    if type(value) is float and value.is_integer():
+        return int(value)
+    return value
+
+def rows_to_dataframe(rows):
+    """Build a DataFrame from an iterable of sheet rows, using the first row as header
+
+    The rows go through the same parser as in read_excel, so missing-value
+    markers like 'n/a', numbers stored as text and header labels come out
+    the same as when reading the file with pandas.
+    """
+    data = []
+    last_row_with_data = -1
+    for row_number, row in enumerate(rows):
+        row = [cell_value(value) for value in row]
+        # Trailing blank cells and rows are dropped, as read_excel does
+        while row and row[-1] == "":
+            row.pop()
+        if row:
+            last_row_with_data = row_number
+        data.append(row)
+    data = data[:last_row_with_data + 1]
+    if not data:
+        return pd.DataFrame()
+
+    width = max(len(row) for row in data)
+    for row in data:
+        row.extend([""] * (width - len(row)))
+    return TextParser(data, header=0, skip_blank_lines=False).read()
+
+def load_sheet_values(file_path):
+    """Load the active sheet once - returns its values as a 2-D array,
+    the bounds of its merged ranges and the workbook"""
+    wb = load_workbook(file_path, data_only=True)
+    ws = wb.active
+
+    # Pre-size the array from the sheet dimensions and fill it row by
+    # row - no intermediate list of row tuples. Cells covered by a merge
+    # come back as None.
+    values = np.empty((ws.max_row, ws.max_column), dtype=object)
+    n_rows = 0
+    for row in ws.iter_rows(values_only=True):
+        values[n_rows] = row
+        n_rows += 1
+    # An empty sheet still reports a 1x1 dimension but yields no rows
+    values = values[:n_rows]
+    merged_bounds = [merged_range.bounds for merged_range in ws.merged_cells.ranges]
+
+    return values, merged_bounds, wb
+
+def values_to_dataframe(values):
+    """Build a DataFrame from a 2-D value array, using the first row as header"""
+    return rows_to_dataframe(values.tolist())
+
+def fill_merged_ranges(values, merged_bounds):
+    """Fill each merged range with its top-left value, in place"""
+    # A single slice assignment per range. Only merged areas are filled,
+    # other blanks stay blank.
+    for min_col, min_row, max_col, max_row in merged_bounds:
+        values[min_row - 1:max_row, min_col - 1:max_col] = values[min_row - 1, min_col - 1]
+    return values
+
+def forward_fill(df):
+    """Forward fill blank cells with the value above them"""
+    # Nothing to fill on dense data - skip the fill pass
+    if not df.isna().any().any():
+        return df
+
+    # Forward fill to fill blank cells with previous values
+    return df.ffill()
 
 def unmerge_cells_and_fill(file_path):
     """Load Excel, unmerge cells, and fill downward"""
-    
-    # Load workbook with openpyxl
-    wb = load_workbook(file_path)
-    ws = wb.active
-    
-    # Create a copy of merged cells ranges before unmerging
-    merged_cells = list(ws.merged_cells.ranges)
-    
-    # First, store all values from merged cells
-    merged_values = {}
-    for merged_range in merged_cells:
-        # Get the value from the top-left cell
-        top_left_cell = ws.cell(row=merged_range.min_row, column=merged_range.min_col)
-        top_left_value = top_left_cell.value
-        
-        # Store the value for all cells in this merged range
-        for row in range(merged_range.min_row, merged_range.max_row + 1):
-            for col in range(merged_range.min_col, merged_range.max_col + 1):
-                cell_ref = (row, col)
-                merged_values[cell_ref] = top_left_value
-    
-    # Now unmerge all cells
-    for merged_range in merged_cells:
-        ws.unmerge_cells(str(merged_range))
-    
-    # Apply the stored values to all previously merged cells
-    for (row, col), value in merged_values.items():
-        # Get the cell (now unmerged) and set its value
-        cell = ws.cell(row=row, column=col)
-        cell.value = value
-    
-    # Save to a temporary file
-    temp_file = "temp_unmerged.xlsx"
-    wb.save(temp_file)
-    
-    # Read with pandas
-    df = pd.read_excel(temp_file, engine='openpyxl')
-    
-    # Optional: Clean up temp file
-    if os.path.exists(temp_file):
-        os.remove(temp_file)
-    
+    values, merged_bounds, wb = load_sheet_values(file_path)
+    if values.size == 0:
+        return pd.DataFrame(), wb
+
+    df = values_to_dataframe(fill_merged_ranges(values, merged_bounds))
+
     return df, wb
 
 def simple_fill_blanks(file_path):
     """Simple method - just forward fill blank cells"""
-    
-    # Read with pandas
-    df = pd.read_excel(file_path, engine='openpyxl')
-    
-    # Forward fill to fill blank cells with previous values
-    df_filled = df.ffill()
-    
-    return df_filled
 
-def save_to_excel_and_json(df, base_filename, output_dir="output"):
-    """Save DataFrame to both Excel and JSON"""
+    if CALAMINE_AVAILABLE:
+        # Native reader - parses the sheet outside the Python interpreter
+        df = pd.read_excel(file_path, engine='calamine')
+    else:
+        # Read values only - read_only mode streams the sheet without
+        # building styled Cell objects for every cell
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            df = rows_to_dataframe(wb.active.iter_rows(values_only=True))
+        finally:
+            wb.close()
+
+    return forward_fill(df)
+
+def sheet_title(title, used_titles):
+    """Turn title into a valid sheet title that is not in used_titles
+
+    Sheet titles are limited to 31 characters and can't contain \\/*?:[].
+    A title already in use (case-insensitively) gets a number appended,
+    with the title shortened so the result still fits. The returned title
+    is added to used_titles.
+    """
+    base = re.sub(r'[\\/*?:\[\]]', '_', title)[:31]
+    title = base
+    count = 0
+    while title.lower() in used_titles:
+        count += 1
+        suffix = str(count)
+        title = base[:31 - len(suffix)] + suffix
+    used_titles.add(title.lower())
+    return title
+
+def append_sheet(wb, df, title):
+    """Append DataFrame as a new sheet of a write-only workbook"""
+    ws = wb.create_sheet(title=title)
+
+    # Blank cells must be None - openpyxl can't write NaN
+    values = df.astype(object).where(df.notna(), None)
+
+    ws.append(list(df.columns))
+    for row in values.itertuples(index=False, name=None):
+        ws.append(row)
+
+def write_excel(df, excel_output):
+    """Write DataFrame to Excel using a streaming write-only workbook"""
+    wb = Workbook(write_only=True)
+    append_sheet(wb, df, "Sheet1")
+    wb.save(excel_output)
+
+def write_combined_excel(sheets, excel_output):
+    """Write (title, DataFrame) pairs as sheets of a single workbook"""
+    wb = Workbook(write_only=True)
+    # Titles are made unique here - openpyxl would append its own number
+    # after cutting them to 31 characters, making them too long
+    used_titles = set()
+    for title, df in sheets:
+        append_sheet(wb, df, sheet_title(title, used_titles))
+    wb.save(excel_output)
+
+def json_default(value):
+    """Encode the cell values json can't - numpy scalars, dates and times"""
+    # Missing dates and nullable values are blank cells
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def save_to_excel_and_json(df, base_filename, output_dir="output", pretty=False,
+                           excel_sheets=None):
+    """Save DataFrame to both Excel and JSON
+
+    When excel_sheets is a list, the DataFrame is added to it for a combined
+    workbook instead of being written to its own Excel file.
+    """
     
-    # Create output directory if it doesn't exist
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    # Create output directory if it doesn't exist (safe when several
+    # worker processes get here at once)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
     
     # Create base filenames
-    excel_output = os.path.join(output_dir, f"{base_filename}_unmerged.xlsx")
-    json_output = os.path.join(output_dir, f"{base_filename}.json")
+    excel_output = output_dir / f"{base_filename}_unmerged.xlsx"
+    json_output = output_dir / f"{base_filename}.json"
     
     # Save to Excel for verification
-    df.to_excel(excel_output, index=False)
-    print(f"✓ Unmerged data saved to: {excel_output}")
-    
-    # Convert to JSON
-    json_data = df.to_dict(orient='records')
-    
-    # Save to JSON with proper formatting
-    with open(json_output, 'w', encoding='utf-8') as f:
-        json.dump(json_data, f, indent=2, ensure_ascii=False)
-    
+    if excel_sheets is not None:
+        excel_sheets.append((base_filename, df))
+        excel_output = None
+    else:
+        write_excel(df, excel_output)
+        print(f"✓ Unmerged data saved to: {excel_output}")
+    
+    # Save to JSON - blank cells become null. Compact by default, indented
+    # only when asked for.
+    orjson = fast_json.orjson
+    if orjson is not None:
+        # orjson writes NaN as null and numpy values natively, so the
+        # records need no cleanup pass first
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        json_bytes = orjson.dumps(df.to_dict(orient='records'), option=option,
+                                  default=json_default)
+    else:
+        # json would write NaN as-is, which isn't valid JSON
+        records = df.astype(object).where(df.notna(), None).to_dict(orient='records')
+        if pretty:
+            json_text = json.dumps(records, indent=2, ensure_ascii=False, default=json_default)
+        else:
+            json_text = json.dumps(records, separators=(',', ':'), ensure_ascii=False,
+                                   default=json_default)
+        json_bytes = json_text.encode('utf-8')
+
+    # Write the encoded document in a single buffered write
+    with open(json_output, 'wb', buffering=1 << 20) as f:
+        f.write(json_bytes)
+
     print(f"✓ JSON data saved to: {json_output}")
     
     return excel_output, json_output
 
-def process_file(input_file, method='simple', output_dir="output"):
+def process_file(input_file, method='simple', output_dir="output", verbose=False, pretty=False,
+                 excel_sheets=None):
     """Process a single Excel file"""
     
-    if not os.path.exists(input_file):
+    input_path = Path(input_file)
+    if not input_path.exists():
         print(f"❌ Error: File '{input_file}' not found!")
         return None
     
@@ -101,33 +249,39 @@ def process_file(input_file, method='simple', output_dir="output"):
     print(f"{'='*60}")
     
     # Get base filename without extension
-    base_name = os.path.splitext(os.path.basename(input_file))[0]
+    base_name = input_path.stem
     
     try:
         if method == 'simple':
             print("Using simple forward-fill method...")
             df = simple_fill_blanks(input_file)
-            excel_file, json_file = save_to_excel_and_json(df, base_name, output_dir)
+            excel_file, json_file = save_to_excel_and_json(df, base_name, output_dir, pretty,
+                                                           excel_sheets)
             
         elif method == 'unmerge':
             print("Using unmerge method...")
             df, _ = unmerge_cells_and_fill(input_file)
-            excel_file, json_file = save_to_excel_and_json(df, base_name, output_dir)
+            excel_file, json_file = save_to_excel_and_json(df, base_name, output_dir, pretty,
+                                                           excel_sheets)
         
         elif method == 'both':
             print("Trying both methods...")
             
+            # Parse the workbook once and run both methods on its values
+            values, merged_bounds, _ = load_sheet_values(input_file)
+            
             # Simple method
-            df_simple = simple_fill_blanks(input_file)
+            df_simple = forward_fill(values_to_dataframe(values))
             excel_simple, json_simple = save_to_excel_and_json(
-                df_simple, f"{base_name}_simple", output_dir
+                df_simple, f"{base_name}_simple", output_dir, pretty, excel_sheets
             )
+            df = df_simple
             
             # Unmerge method
             try:
-                df_unmerged, _ = unmerge_cells_and_fill(input_file)
+                df_unmerged = values_to_dataframe(fill_merged_ranges(values.copy(), merged_bounds))
                 excel_unmerged, json_unmerged = save_to_excel_and_json(
-                    df_unmerged, f"{base_name}_unmerged", output_dir
+                    df_unmerged, f"{base_name}_unmerged", output_dir, pretty, excel_sheets
                 )
             except Exception as e:
                 print(f"⚠ Unmerge method failed: {e}")
@@ -136,10 +290,11 @@ def process_file(input_file, method='simple', output_dir="output"):
             print(f"❌ Unknown method: {method}")
             return None
         
-        # Show preview
-        print("\n📊 Preview of data (first 5 rows):")
-        print(df.head())
-        print(f"\n📋 Column names: {df.columns.tolist()}")
+        # Show preview - formatting the frame is wasted work in batch runs
+        if verbose:
+            print("\n📊 Preview of data (first 5 rows):")
+            print(df.head())
+            print(f"\n📋 Column names: {df.columns.tolist()}")
         print(f"📈 Total rows: {len(df)}")
         print(f"📊 Total columns: {len(df.columns)}")
         
@@ -151,6 +306,20 @@ def process_file(input_file, method='simple', output_dir="output"):
         traceback.print_exc()
         return None
 
+def process_file_worker(input_file, method='simple', output_dir="output", verbose=False,
+                        pretty=False, combine=False):
+    """Process a file in a worker process
+
+    Returns whether it succeeded, when combining the sheets to add to the
+    combined workbook, and what it printed.
+    """
+    excel_sheets = [] if combine else None
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        succeeded = process_file(input_file, method, output_dir, verbose, pretty,
+                                 excel_sheets) is not None
+    return succeeded, excel_sheets or [], output.getvalue()
+
 def main():
     parser = argparse.ArgumentParser(
         description='Convert Excel files with merged cells to JSON',
@@ -163,6 +332,9 @@ Examples:
   %(prog)s data.xlsx -m unmerge         # Use unmerge method
   %(prog)s data.xlsx -o custom_output   # Specify output directory
   %(prog)s data.xlsx -p                 # Show preview only
+  %(prog)s data.xlsx -v                 # Show data preview after processing
+  %(prog)s data.xlsx --pretty           # Write indented JSON
+  %(prog)s *.xlsx -c                    # Write one combined Excel workbook
         """
     )
     
@@ -191,6 +363,24 @@ Examples:
         help='Show preview only, don\'t save files'
     )
     
+    parser.add_argument(
+        '-c', '--combine',
+        action='store_true',
+        help='Write all Excel output to one combined.xlsx, one sheet per file'
+    )
+    
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Write indented JSON (default: compact)'
+    )
+    
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='Show a preview of each processed file'
+    )
+    
     parser.add_argument(
         '--version',
         action='version',
@@ -207,10 +397,11 @@ Examples:
     
     # Process each file
     successful = 0
-    for file_path in args.files:
-        if args.preview:
+    combined_sheets = [] if args.combine else None
+    if args.preview:
+        for file_path in args.files:
             # Preview mode
-            if os.path.exists(file_path):
+            if Path(file_path).exists():
                 try:
                     df = simple_fill_blanks(file_path)
                     print(f"\n📄 File: {file_path}")
@@ -225,11 +416,29 @@ Examples:
                     print(f"❌ Error previewing {file_path}: {e}")
             else:
                 print(f"❌ File not found: {file_path}")
-        else:
-            # Process and save mode
-            result = process_file(file_path, args.method, args.output)
-            if result is not None:
-                successful += 1
+    elif len(args.files) == 1:
+        # Process and save mode
+        if process_file(args.files[0], args.method, args.output,
+                        args.verbose, args.pretty, combined_sheets) is not None:
+            successful += 1
+    else:
+        # Files are independent - process them in parallel worker processes and
+        # print each file's output in the original order
+        worker = partial(process_file_worker, method=args.method, output_dir=args.output,
+                         verbose=args.verbose, pretty=args.pretty, combine=args.combine)
+        max_workers = min(len(args.files), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for succeeded, sheets, output in executor.map(worker, args.files):
+                sys.stdout.write(output)
+                successful += succeeded
+                if combined_sheets is not None:
+                    combined_sheets.extend(sheets)
+    
+    # Write all sheets into one workbook - one zip container for the batch
+    if combined_sheets:
+        combined_output = Path(args.output) / "combined.xlsx"
+        write_combined_excel(combined_sheets, combined_output)
+        print(f"\n✓ Combined Excel data saved to: {combined_output}")
     
     print(f"\n{'='*60}")
     print(f"✅ Processing complete!")
@@ -238,11 +447,10 @@ Examples:
     
     if not args.preview and successful > 0:
         print("\n📁 Files created:")
-        if os.path.exists(args.output):
-            for file in sorted(os.listdir(args.output)):
-                if file.endswith('.json') or file.endswith('.xlsx'):
-                    size = os.path.getsize(os.path.join(args.output, file))
-                    print(f"   • {file} ({size:,} bytes)")
+        if Path(args.output).exists():
+            for entry in sorted(os.scandir(args.output), key=lambda e: e.name):
+                if entry.name.endswith(('.json', '.xlsx')):
+                    print(f"   • {entry.name} ({entry.stat().st_size:,} bytes)")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
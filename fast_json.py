@@ -0,0 +1,101 @@
+"""
+Shared JSON helpers for the scripts in this repository
+
+orjson parses and serializes several times faster than the stdlib json
+module. It is used only where it gives the same result as json; other
+documents, and everything when orjson is not installed, go through json.
+"""
+
+import json
+import mmap
+import os
+from typing import Any, Iterable, Iterator, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _floats(data: Any) -> Iterator[float]:
+    """Yield every float value in data"""
+    if isinstance(data, float):
+        yield data
+    elif isinstance(data, (dict, list, tuple)):
+        stack = [data]
+        while stack:
+            container = stack.pop()
+            for value in (container.values() if isinstance(container, dict) else container):
+                if isinstance(value, str):
+                    continue
+                if isinstance(value, float):
+                    yield value
+                elif isinstance(value, (dict, list, tuple)):
+                    stack.append(value)
+
+def loads(raw: bytes) -> Any:
+    """Parse JSON from bytes"""
+    if orjson is not None:
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity tokens, a BOM, lone surrogate escapes - json
+            # accepts these or reports the error itself
+            pass
+        else:
+            # orjson parses integers beyond 64 bits as floats; only a float
+            # this large can be one
+            if not any(abs(value) >= 2 ** 63 for value in _floats(data)):
+                return data
+    return json.loads(bytes(raw))
+
+def dumps(data: Any, indent: Optional[int] = 2) -> bytes:
+    """Serialize data to UTF-8 JSON bytes"""
+    # orjson only supports two-space indentation. It writes NaN and
+    # Infinity as null, and floats json writes in exponent notation
+    # differently (1e16 vs 1e+16, 0.00001 vs 1e-05)
+    if orjson is not None and indent == 2 and not any(
+            value and not 1e-4 <= abs(value) < 1e16 for value in _floats(data)):
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Integers beyond 64 bits, lone surrogates, unknown types
+            pass
+    return json.dumps(data, indent=indent, ensure_ascii=False).encode('utf-8')
+
+def load_file(path: str) -> Any:
+    """Parse a JSON file, memory-mapping it when orjson can read the map directly"""
+    with open(path, 'rb') as f:
+        if orjson is None or os.fstat(f.fileno()).st_size == 0:
+            return loads(f.read())
+        # orjson parses straight out of the mapped pages, so the file content
+        # is never copied into a separate bytes object first
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return loads(view)
+
+def save_json_array_streaming(path: str, items: Iterable[Any]) -> int:
+    """
+    Write items to a JSON array file one at a time
+    
+    The output is identical to dumps() of the same list, without building
+    the whole document in memory first. It is written to a temporary file
+    that replaces path once complete, so an error half-way through never
+    leaves a truncated file behind. Returns the number of items written.
+    """
+    # Include the pid so parallel worker processes never share a temp file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    count = 0
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(b'[')
+            for item in items:
+                f.write(b',\n  ' if count else b'\n  ')
+                f.write(dumps(item).replace(b'\n', b'\n  '))
+                count += 1
+            f.write(b'\n]' if count else b']')
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
@@ -4,27 +4,154 @@ Xerox Consumables Library - Terminal/CMD Interface
 Search and manage Xerox printer consumables data
 """
 
+import io
 import json
 import sys
 import os
+import re
 from pathlib import Path
 import argparse
-from collections import defaultdict
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from functools import lru_cache
+from itertools import groupby
+
+import fast_json
+
+# readline gives the input() prompts line editing and history; it is not
+# available on every platform (e.g. Windows)
+try:
+    import readline  # noqa: F401
+except ImportError:
+    pass
 
 # Configuration
 DATA_FILE = "xerox_data.json"
 
+# Parsed database, keyed on the file's (mtime, size) so it is only
+# re-parsed when the file actually changes
+_DATA_CACHE = {"key": None, "data": None}
+
+# Yield search queries: ">5000", "<10000", "5000-10000" or "5000"
+_YIELD_QUERY_RE = re.compile(
+    r"^\s*(?:(?P<op>[<>])\s*(?P<bound>\d+)|(?P<low>\d+)(?:\s*-\s*(?P<high>\d+))?)\s*$"
+)
+
+# Range of the packed yield index arrays
+_INT64_MIN, _INT64_MAX = -2**63, 2**63 - 1
+
+class _ColorMap(dict):
+    """ANSI color codes looked up by color name as stored in the data
+
+    Names are matched case-insensitively; the lowercased lookup is done
+    once per distinct spelling and remembered, and unknown colors map
+    to "" (no color code).
+    """
+
+    def __missing__(self, color):
+        code = self.get(color.lower(), "")
+        self[color] = code
+        return code
+
+
+# ANSI color codes for consumable colors
+COLOR_CODES = _ColorMap({
+    "black": "\033[90m",    # Dark gray
+    "cyan": "\033[96m",     # Cyan
+    "magenta": "\033[95m",  # Magenta
+    "yellow": "\033[93m",   # Yellow
+})
+
+# Column headers and widths for display_results_clustered - INCLUDING CHIP TYPE
+_CLUSTERED_HEADER = "│ " + "".join(
+    f"{header:<{width}} │ "
+    for header, width in zip(
+        ["Part Number", "Color", "Yield", "Region", "Metered/Sold", "IOT", "Chip Type"],
+        [18, 12, 10, 12, 14, 15, 12],
+    )
+)
+
+# Result row for display_results_clustered: part number (blue), color
+# (color coded), yield, region, metered/sold, IOT, chip type. Each value
+# is padded and truncated to its column width.
+_CLUSTERED_ROW_FMT = (
+    "│ \033[94m{0:<18.18}\033[0m │ {color_code}{1:<12.12}\033[0m │ {2:<10.10} │ "
+    "{3:<12.12} │ {4:<14.14} │ {5:<15.15} │ {6:<12.12} │"
+)
+
+# Consumable type blocks in display_results_clustered, in display order;
+# anything that is not a toner or drum is shown under "other"
+CLUSTERED_CTYPES = ["toner", "drum", "other"]
+CTYPE_ORDER = {"toner": 0, "drum": 1}
+
+# Main menu for interactive mode, written out in one call by show_menu()
+_MENU = "\n".join([
+    "",
+    "=" * 50,
+    "🖨️  XEROX CONSUMABLES LIBRARY",
+    "=" * 50,
+    "1. 🔍 Search by Printer Model",
+    "2. 🔢 Search by Part Number",
+    "3. 🎨 Search by Color/Drum",
+    "4. 🔧 Search by IOT Codename",
+    "5. 🌍 Search by Region/Zone",
+    "6. 📊 Search by Yield Range",
+    "7. 🔧 Search by Consumable Type (toner/drum)",
+    "8. 📋 List All Items",
+    "9. ➕ Add New Item",
+    "10. 📥 Import from Text",
+    "11. 📤 Export to JSON",
+    "12. 📊 Show Statistics",
+    "0. 🚪 Exit",
+    "-" * 50,
+    "",
+])
+
+# Search types answered by exact (case-insensitive) match, and their field
+EXACT_SEARCH_FIELDS = {
+    "part": "part_number",
+    "color": "color",
+    "consumable_type": "consumable_type",
+}
+
+# Search types answered by substring match, and their field
+SUBSTRING_SEARCH_FIELDS = {
+    "model": "printer_model",
+    "iot": "iot_codename",
+    "region": "region_zone",
+}
+
+# Search indexes for the cached data, see get_indexes()
+_INDEX_CACHE = {"key": None, "data": None, "indexes": None}
+
+# Per-model overview for the cached data, see get_model_index()
+_MODEL_INDEX_CACHE = {"key": None, "data": None, "models": None}
+
+
+def _file_key(stat):
+    """Cache key for a stat result of the database file"""
+    return (stat.st_mtime_ns, stat.st_size)
+
 
 def load_data():
     """Load data from JSON file"""
     try:
-        if not Path(DATA_FILE).exists():
+        try:
+            key = _file_key(os.stat(DATA_FILE))
+        except FileNotFoundError:
             print(f"⚠️  Database file '{DATA_FILE}' not found.")
             print("   Please create a JSON file or run the script with sample data.")
             return []
-        
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+
+        if key == _DATA_CACHE["key"]:
+            return _DATA_CACHE["data"]
+
+        data = fast_json.load_file(DATA_FILE)
+
+        _DATA_CACHE["key"] = key
+        _DATA_CACHE["data"] = data
+        return data
     except json.JSONDecodeError:
         print(f"❌ Error: '{DATA_FILE}' contains invalid JSON.")
         return []
@@ -35,9 +162,17 @@ def load_data():
 
 def save_data(data):
     """Save data to JSON file"""
+    # Drop the cached copy first - callers may have modified it in place
+    _DATA_CACHE["key"] = None
     try:
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Written to a temporary file next to the database and renamed over
+        # the original, so a failed write never leaves a truncated (or
+        # temporary) file behind
+        fast_json.save_json_array_streaming(DATA_FILE, data)
+
+        # What we just wrote is the new file content
+        _DATA_CACHE["key"] = _file_key(os.stat(DATA_FILE))
+        _DATA_CACHE["data"] = data
         return True
     except Exception as e:
         print(f"❌ Error saving data: {e}")
@@ -46,116 +181,167 @@ def save_data(data):
 
 def parse_yield_range(query):
     """Parse yield range query like '5000-10000' or '>5000' or '<10000'"""
-    query = query.strip()
+    match = _YIELD_QUERY_RE.match(query)
+    if not match:
+        return None
 
-    # Handle ranges like "5000-10000"
-    if "-" in query and not query.startswith("-"):
-        parts = query.split("-")
-        if len(parts) == 2:
-            try:
-                min_val = int(parts[0].strip())
-                max_val = int(parts[1].strip())
-                return ("range", min_val, max_val)
-            except ValueError:
-                return None
-
-    # Handle ">5000"
-    if query.startswith(">"):
-        try:
-            val = int(query[1:].strip())
-            return ("greater", val, None)
-        except ValueError:
-            return None
+    # Handle ">5000" and "<10000"
+    if match["op"] == ">":
+        return ("greater", int(match["bound"]), None)
+    if match["op"] == "<":
+        return ("less", int(match["bound"]), None)
 
-    # Handle "<10000"
-    if query.startswith("<"):
-        try:
-            val = int(query[1:].strip())
-            return ("less", val, None)
-        except ValueError:
-            return None
+    # Handle ranges like "5000-10000"
+    if match["high"] is not None:
+        return ("range", int(match["low"]), int(match["high"]))
 
     # Handle exact match "5000"
+    return ("exact", int(match["low"]), None)
+
+
+def parse_yield_value(value):
+    """Parse a stored yield like '30,000' to an int, or None if not a number"""
+    if not value:
+        return None
     try:
-        val = int(query)
-        return ("exact", val, None)
-    except ValueError:
+        return int(str(value).replace(",", ""))
+    except (ValueError, TypeError):
         return None
 
 
-def search_data(search_type, query):
-    """Search data based on type and query"""
-    data = load_data()
-    results = []
+def get_indexes(data):
+    """Return search indexes for data
+
+    - "fields": exact-match indexes, field -> lowercased value -> items
+    - "lowered": lowercased values of the substring-search fields, one
+      list per field in data order
+    - "yield_keys" / "yield_positions": numeric yields in ascending order
+      and the position of each item in data, for bisect range queries.
+      Stored as packed int64 arrays rather than lists of int objects.
+
+    Built on first use and rebuilt whenever the database changes.
+    """
+    if _INDEX_CACHE["data"] is data and _INDEX_CACHE["key"] == _DATA_CACHE["key"]:
+        return _INDEX_CACHE["indexes"]
+
+    # Lowercase one field at a time. str.lower already has an ASCII fast
+    # path in CPython, so the cost here is the per-item loop overhead
+    lowered = {
+        field: [(item.get(field) or "").lower() for item in data]
+        for field in SUBSTRING_SEARCH_FIELDS.values()
+    }
+    fields = {}
+    for field in EXACT_SEARCH_FIELDS.values():
+        fields[field] = index = {}
+        for item in data:
+            index.setdefault((item.get(field) or "").lower(), []).append(item)
 
+    yields = []
+    for position, item in enumerate(data):
+        yield_val = parse_yield_value(item.get("yield", ""))
+        if yield_val is not None and _INT64_MIN <= yield_val <= _INT64_MAX:
+            yields.append((yield_val, position))
+
+    yields.sort()
+    indexes = {
+        "fields": fields,
+        "lowered": lowered,
+        "yield_keys": array("q", [yield_val for yield_val, _ in yields]),
+        "yield_positions": array("q", [position for _, position in yields]),
+    }
+
+    _INDEX_CACHE["key"] = _DATA_CACHE["key"]
+    _INDEX_CACHE["data"] = data
+    _INDEX_CACHE["indexes"] = indexes
+    return indexes
+
+
+def get_model_index(data):
+    """Return the per-model overview used by list_all
+
+    Maps each printer model to its items, toner and drum counts, part
+    numbers and colors, collected in a single pass over data. Built on
+    first use and rebuilt whenever the database changes.
+    """
+    if _MODEL_INDEX_CACHE["data"] is data and _MODEL_INDEX_CACHE["key"] == _DATA_CACHE["key"]:
+        return _MODEL_INDEX_CACHE["models"]
+
+    models = {}
+    for item in data:
+        model = item.get("printer_model", "Unknown")
+        entry = models.get(model)
+        if entry is None:
+            entry = models[model] = {
+                "items": [],
+                "toners": 0,
+                "drums": 0,
+                "unique_parts": set(),
+                "colors": set(),
+            }
+        entry["items"].append(item)
+        ctype = (item.get("consumable_type") or "").lower()
+        if ctype == "toner":
+            entry["toners"] += 1
+        elif ctype == "drum":
+            entry["drums"] += 1
+        entry["unique_parts"].add(item.get("part_number", ""))
+        if item.get("color"):
+            entry["colors"].add(item.get("color", ""))
+
+    _MODEL_INDEX_CACHE["key"] = _DATA_CACHE["key"]
+    _MODEL_INDEX_CACHE["data"] = data
+    _MODEL_INDEX_CACHE["models"] = models
+    return models
+
+
+def search_data(search_type, query, data=None):
+    """Search data based on type and query (loads the database if data is None)"""
+    if data is None:
+        data = load_data()
     query_lower = query.lower()
 
-    for item in data:
-        match = False
-
-        if search_type == "model":
-            # Search in printer_model field
-            if query_lower in item.get("printer_model", "").lower():
-                match = True
-
-        elif search_type == "part":
-            # Exact match for part number (case-insensitive)
-            if query_lower == item.get("part_number", "").lower():
-                match = True
-
-        elif search_type == "color":
-            # Exact match for color (case-insensitive)
-            if query_lower == item.get("color", "").lower():
-                match = True
-
-        elif search_type == "iot":
-            # Search in iot_codename field
-            if query_lower in item.get("iot_codename", "").lower():
-                match = True
-
-        elif search_type == "region":
-            # Search in region_zone field
-            if query_lower in item.get("region_zone", "").lower():
-                match = True
-
-        elif search_type == "consumable_type":
-            # Exact match for consumable_type (case-insensitive)
-            if query_lower == item.get("consumable_type", "").lower():
-                match = True
-
-        elif search_type == "yield":
-            # Parse yield range and compare
-            yield_spec = parse_yield_range(query)
-            if yield_spec:
-                item_yield = item.get("yield", "")
-                if item_yield:
-                    try:
-                        item_yield_val = int(str(item_yield).replace(",", ""))
-                        op_type, val1, val2 = yield_spec
-
-                        if op_type == "range":
-                            if val1 <= item_yield_val <= val2:
-                                match = True
-                        elif op_type == "greater":
-                            if item_yield_val > val1:
-                                match = True
-                        elif op_type == "less":
-                            if item_yield_val < val1:
-                                match = True
-                        elif op_type == "exact":
-                            if item_yield_val == val1:
-                                match = True
-                    except (ValueError, TypeError):
-                        pass
-
-        if match:
-            results.append(item)
-
-    return results
+    # Exact-match searches (case-insensitive) are a single index lookup
+    if search_type in EXACT_SEARCH_FIELDS:
+        index = get_indexes(data)["fields"][EXACT_SEARCH_FIELDS[search_type]]
+        return list(index.get(query_lower, []))
+
+    # Yield searches bisect the sorted yields instead of scanning every item
+    if search_type == "yield":
+        yield_spec = parse_yield_range(query)
+        if not yield_spec:
+            return []
+
+        indexes = get_indexes(data)
+        keys = indexes["yield_keys"]
+        op_type, val1, val2 = yield_spec
+
+        if op_type == "range":
+            lo, hi = bisect_left(keys, val1), bisect_right(keys, val2)
+        elif op_type == "greater":
+            lo, hi = bisect_right(keys, val1), len(keys)
+        elif op_type == "less":
+            lo, hi = 0, bisect_left(keys, val1)
+        else:
+            lo, hi = bisect_left(keys, val1), bisect_right(keys, val1)
 
+        # Return matches in database order, like the other searches
+        return [data[position] for position in sorted(indexes["yield_positions"][lo:hi])]
 
+    # Substring searches run against values lowercased once per load
+    if search_type in SUBSTRING_SEARCH_FIELDS:
+        lowered = get_indexes(data)["lowered"][SUBSTRING_SEARCH_FIELDS[search_type]]
+        return [item for item, value in zip(data, lowered) if query_lower in value]
+
+    return []
+
+
+@lru_cache(maxsize=4096)
 def format_yield(yield_str):
-    """Format yield for display - shorten large numbers"""
+    """Format yield for display - shorten large numbers
+
+    Catalogs only use a handful of distinct yields, so the formatted
+    strings are cached instead of re-parsed for every displayed row.
+    """
     if not yield_str or str(yield_str).lower() == "n/a":
         return "N/A"
     
@@ -174,117 +360,96 @@ def format_yield(yield_str):
         return str(yield_str)[:8]  # Truncate if not a number
 
 
+def flush_output(out):
+    """Write buffered display output to stdout in one call and reset the buffer"""
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
+    out.seek(0)
+    out.truncate()
+
+
+def _clustered_sort_key(item):
+    """Sort key for display_results_clustered: model, consumable type, color, part number"""
+    model = item.get("printer_model", "Unknown Model").strip() or "Unknown Model"
+    ctype_rank = CTYPE_ORDER.get(item.get("consumable_type", "unknown").lower(), 2)
+    return (model, ctype_rank, item.get("color", ""), item.get("part_number", ""))
+
+
 def display_results_clustered(results):
     """Display results clustered by printer model in column format"""
     if not results:
         print("No results found.")
         return
 
-    print(f"\n📋 Found {len(results)} result(s):")
-    print("=" * 140)
+    # Output is collected here and written out once per model
+    out = io.StringIO()
 
-    # Group results by printer model
-    model_groups = defaultdict(list)
-    for item in results:
-        model = item.get("printer_model", "Unknown Model").strip()
-        if not model:
-            model = "Unknown Model"
-        model_groups[model].append(item)
+    print(f"\n📋 Found {len(results)} result(s):", file=out)
+    print("=" * 140, file=out)
 
-    # Sort models alphabetically
-    sorted_models = sorted(model_groups.keys())
+    # Sort once by model, consumable type, color and part number, then
+    # walk the model and consumable type groups in that order
+    keyed = sorted(
+        ((_clustered_sort_key(item), item) for item in results),
+        key=lambda pair: pair[0],
+    )
 
-    for model_idx, model in enumerate(sorted_models, 1):
-        items = model_groups[model]
-        
-        print(f"\n🔷 MODEL #{model_idx}: {model}")
-        print("─" * 140)
+    for model_idx, (model, model_pairs) in enumerate(groupby(keyed, key=lambda pair: pair[0][0]), 1):
+        # Summary figures, collected while the rows are printed
+        color_counts = Counter()
+        regions = set()
+        min_yield = max_yield = None
         
-        # Group items by consumable type (toner/drum)
-        consumable_types = defaultdict(list)
-        for item in items:
-            ctype = item.get("consumable_type", "unknown").lower()
-            if ctype not in ["toner", "drum"]:
-                ctype = "other"
-            consumable_types[ctype].append(item)
+        print(f"\n🔷 MODEL #{model_idx}: {model}", file=out)
+        print("─" * 140, file=out)
         
         # Display toners first, then drums, then others
-        for ctype in ["toner", "drum", "other"]:
-            if ctype in consumable_types and consumable_types[ctype]:
-                ctype_items = consumable_types[ctype]
-                
-                # Get emoji for consumable type
-                emoji = "🖨️" if ctype == "toner" else "⚙️" if ctype == "drum" else "📦"
-                print(f"\n{emoji} {ctype.upper()}S ({len(ctype_items)} item(s)):")
-                print("├" + "─" * 138)
-                
-                # Column headers and widths - INCLUDING CHIP TYPE
-                headers = ["Part Number", "Color", "Yield", "Region", "Metered/Sold", "IOT", "Chip Type"]
-                max_widths = [18, 12, 10, 12, 14, 15, 12]
-                
-                # Print header
-                header_line = "│ "
-                for i, header in enumerate(headers):
-                    header_line += f"{header:<{max_widths[i]}} │ "
-                print(header_line)
-                print("├" + "─" * 138)
-                
-                # Print items
-                for item in sorted(ctype_items, key=lambda x: (x.get("color", ""), x.get("part_number", ""))):
-                    # Get and format values
-                    part_num = item.get("part_number", "N/A")
-                    color = item.get("color", "N/A") or "N/A"
-                    yield_val = format_yield(item.get("yield", "N/A"))
-                    region = item.get("region_zone", "N/A") or "N/A"
-                    metered = item.get("metered_sold", "N/A") or "N/A"
-                    iot = item.get("iot_codename", "N/A") or "N/A"
-                    chip = item.get("chip_type", "N/A") or "N/A"
-                    
-                    # Truncate values if needed
-                    part_display = part_num[:max_widths[0]]
-                    color_display = color[:max_widths[1]]
-                    yield_display = yield_val[:max_widths[2]]
-                    region_display = region[:max_widths[3]]
-                    metered_display = metered[:max_widths[4]]
-                    iot_display = iot[:max_widths[5]]
-                    chip_display = chip[:max_widths[6]]
-                    
-                    # Color coding for part numbers (blue)
-                    part_display = f"\033[94m{part_display:<{max_widths[0]}}\033[0m"
-                    
-                    # Color coding for colors
-                    color_map = {
-                        "black": "\033[90m",    # Dark gray
-                        "cyan": "\033[96m",     # Cyan
-                        "magenta": "\033[95m",  # Magenta
-                        "yellow": "\033[93m",   # Yellow
-                    }
-                    color_code = color_map.get(color.lower(), "")
-                    color_display = f"{color_code}{color_display:<{max_widths[1]}}\033[0m"
-                    
-                    # Build the line
-                    line = "│ "
-                    line += f"{part_display} │ "
-                    line += f"{color_display} │ "
-                    line += f"{yield_display:<{max_widths[2]}} │ "
-                    line += f"{region_display:<{max_widths[3]}} │ "
-                    line += f"{metered_display:<{max_widths[4]}} │ "
-                    line += f"{iot_display:<{max_widths[5]}} │ "
-                    line += f"{chip_display:<{max_widths[6]}} │"
-                    print(line)
-                
-                print("└" + "─" * 138)
+        for ctype_rank, ctype_pairs in groupby(model_pairs, key=lambda pair: pair[0][1]):
+            ctype = CLUSTERED_CTYPES[ctype_rank]
+            ctype_items = [item for _, item in ctype_pairs]
+            
+            # Get emoji for consumable type
+            emoji = "🖨️" if ctype == "toner" else "⚙️" if ctype == "drum" else "📦"
+            print(f"\n{emoji} {ctype.upper()}S ({len(ctype_items)} item(s)):", file=out)
+            print("├" + "─" * 138, file=out)
+            
+            # Print header
+            print(_CLUSTERED_HEADER, file=out)
+            print("├" + "─" * 138, file=out)
+            
+            # Print items - rows are formatted from the prebuilt
+            # template and written out as one block
+            rows = []
+            for item in ctype_items:
+                color = item.get("color") or "N/A"
+                color_counts[item.get("color") or "Unknown"] += 1
+                if item.get("region_zone"):
+                    regions.add(item["region_zone"])
+                yield_val = parse_yield_value(item.get("yield"))
+                if yield_val is not None:
+                    if min_yield is None or yield_val < min_yield:
+                        min_yield = yield_val
+                    if max_yield is None or yield_val > max_yield:
+                        max_yield = yield_val
+                rows.append(_CLUSTERED_ROW_FMT.format(
+                    item.get("part_number", "N/A"),
+                    color,
+                    format_yield(item.get("yield", "N/A")),
+                    item.get("region_zone", "N/A") or "N/A",
+                    item.get("metered_sold", "N/A") or "N/A",
+                    item.get("iot_codename", "N/A") or "N/A",
+                    item.get("chip_type", "N/A") or "N/A",
+                    color_code=COLOR_CODES[color],
+                ))
+            out.write("\n".join(rows) + "\n")
+            
+            print("└" + "─" * 138, file=out)
         
         # Print summary for this model
-        print("\n📊 MODEL SUMMARY:")
-        print("├" + "─" * 60)
+        print("\n📊 MODEL SUMMARY:", file=out)
+        print("├" + "─" * 60, file=out)
         
         # Count by color for this model
-        color_counts = defaultdict(int)
-        for item in items:
-            color = item.get("color", "Unknown") or "Unknown"
-            color_counts[color] += 1
-        
         if color_counts:
             colors_display = []
             for color, count in sorted(color_counts.items()):
@@ -292,30 +457,18 @@ def display_results_clustered(results):
                     colors_display.append(f"{color} ({count})")
             
             if colors_display:
-                print(f"│ 🎨 Colors: {', '.join(colors_display)}")
+                print(f"│ 🎨 Colors: {', '.join(colors_display)}", file=out)
         
         # Yield statistics
-        yields = []
-        for item in items:
-            if item.get("yield"):
-                try:
-                    yields.append(int(str(item["yield"]).replace(",", "")))
-                except (ValueError, TypeError):
-                    pass
-        
-        if yields:
-            print(f"│ 📊 Yield Range: {min(yields):,} - {max(yields):,} pages")
+        if min_yield is not None:
+            print(f"│ 📊 Yield Range: {min_yield:,} - {max_yield:,} pages", file=out)
         
         # Region info
-        regions = set()
-        for item in items:
-            if item.get("region_zone"):
-                regions.add(item["region_zone"])
-        
         if regions:
-            print(f"│ 🌍 Regions: {', '.join(sorted(regions))}")
+            print(f"│ 🌍 Regions: {', '.join(sorted(regions))}", file=out)
         
-        print("└" + "─" * 60)
+        print("└" + "─" * 60, file=out)
+        flush_output(out)
 
 
 def display_results_simple(results):
@@ -324,16 +477,19 @@ def display_results_simple(results):
         print("No results found.")
         return
 
-    print(f"\n📋 Found {len(results)} result(s):")
-    print("=" * 120)
+    # Output is collected here and written out in one go
+    out = io.StringIO()
+
+    print(f"\n📋 Found {len(results)} result(s):", file=out)
+    print("=" * 120, file=out)
 
     for idx, item in enumerate(results, 1):
-        print(f"\n📦 ITEM #{idx}:")
-        print("─" * 120)
+        print(f"\n📦 ITEM #{idx}:", file=out)
+        print("─" * 120, file=out)
         
         # Main details in columns WITH CHIP TYPE
-        print("│ Part Number     │ Color        │ Yield     │ Region       │ Metered/Sold │ IOT         │ Chip Type   │")
-        print("├─────────────────┼──────────────┼───────────┼──────────────┼──────────────┼─────────────┼─────────────┤")
+        print("│ Part Number     │ Color        │ Yield     │ Region       │ Metered/Sold │ IOT         │ Chip Type   │", file=out)
+        print("├─────────────────┼──────────────┼───────────┼──────────────┼──────────────┼─────────────┼─────────────┤", file=out)
         
         part_num = item.get("part_number", "N/A")
         color = item.get("color", "N/A") or "N/A"
@@ -346,21 +502,15 @@ def display_results_simple(results):
         # Color coding
         part_display = f"\033[94m{part_num[:15]:<15}\033[0m"
         
-        color_map = {
-            "black": "\033[90m",
-            "cyan": "\033[96m",
-            "magenta": "\033[95m",
-            "yellow": "\033[93m",
-        }
-        color_code = color_map.get(color.lower(), "")
+        color_code = COLOR_CODES[color]
         color_display = f"{color_code}{color[:12]:<12}\033[0m"
         
         line = f"│ {part_display} │ {color_display} │ {yield_val[:9]:<9} │ {region[:12]:<12} │ {metered[:12]:<12} │ {iot[:11]:<11} │ {chip[:11]:<11} │"
-        print(line)
-        print("└─────────────────┴──────────────┴───────────┴──────────────┴──────────────┴─────────────┴─────────────┘")
+        print(line, file=out)
+        print("└─────────────────┴──────────────┴───────────┴──────────────┴──────────────┴─────────────┴─────────────┘", file=out)
         
         # Additional details below
-        print("\n📝 Additional Details:")
+        print("\n📝 Additional Details:", file=out)
         details = [
             ("🖨️  Printer Model", item.get("printer_model", "N/A")),
             ("🔧 Type", item.get("consumable_type", "N/A")),
@@ -376,9 +526,11 @@ def display_results_simple(results):
                 value = "N/A"
             
             if value and value != "N/A":
-                print(f"  {emoji} {label}: {value}")
+                print(f"  {emoji} {label}: {value}", file=out)
         
-        print("─" * 120)
+        print("─" * 120, file=out)
+
+    flush_output(out)
 
 
 def add_item():
@@ -405,9 +557,10 @@ def add_item():
         print(f"\n❌ Failed to save item '{item['part_number']}'.")
 
 
-def list_all():
+def list_all(data=None):
     """List all items with pagination"""
-    data = load_data()
+    if data is None:
+        data = load_data()
 
     if not data:
         print("No items in database.")
@@ -417,10 +570,7 @@ def list_all():
     print("=" * 80)
 
     # Group by model for better overview
-    models = defaultdict(list)
-    for item in data:
-        model = item.get("printer_model", "Unknown")
-        models[model].append(item)
+    models = get_model_index(data)
 
     page_size = 5  # Show 5 models per page
     model_list = sorted(models.keys())
@@ -435,19 +585,16 @@ def list_all():
         print("─" * 40)
 
         for model in page_models:
-            items = models[model]
-            toner_count = sum(1 for i in items if i.get("consumable_type", "").lower() == "toner")
-            drum_count = sum(1 for i in items if i.get("consumable_type", "").lower() == "drum")
+            entry = models[model]
             
             print(f"\n🖨️  {model[:60]}...")
-            print(f"   📦 Items: {len(items)} (🖨️ {toner_count} toner(s), ⚙️ {drum_count} drum(s))")
+            print(f"   📦 Items: {len(entry['items'])} (🖨️ {entry['toners']} toner(s), ⚙️ {entry['drums']} drum(s))")
             
             # Show unique part numbers count
-            unique_parts = len(set(i.get("part_number", "") for i in items))
-            print(f"   🔢 Unique Parts: {unique_parts}")
+            print(f"   🔢 Unique Parts: {len(entry['unique_parts'])}")
             
             # Show color summary
-            colors = set(i.get("color", "") for i in items if i.get("color"))
+            colors = entry["colors"]
             if colors:
                 print(f"   🎨 Colors: {', '.join(sorted(colors)[:3])}" + ("..." if len(colors) > 3 else ""))
         
@@ -502,9 +649,10 @@ def import_from_text():
         print(f"\n❌ Failed to save imported items.")
 
 
-def export_to_json():
+def export_to_json(data=None):
     """Export current database to JSON file"""
-    data = load_data()
+    if data is None:
+        data = load_data()
     if not data:
         print("No data to export.")
         return
@@ -517,8 +665,8 @@ def export_to_json():
         export_file += '.json'
     
     try:
-        with open(export_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(export_file, "wb") as f:
+            f.write(fast_json.dumps(data))
         print(f"\n✅ Database exported to '{export_file}' successfully!")
         print(f"   Total items: {len(data)}")
     except Exception as e:
@@ -527,72 +675,60 @@ def export_to_json():
 
 def show_menu():
     """Display main menu"""
-    print("\n" + "=" * 50)
-    print("🖨️  XEROX CONSUMABLES LIBRARY")
-    print("=" * 50)
-    print("1. 🔍 Search by Printer Model")
-    print("2. 🔢 Search by Part Number")
-    print("3. 🎨 Search by Color/Drum")
-    print("4. 🔧 Search by IOT Codename")
-    print("5. 🌍 Search by Region/Zone")
-    print("6. 📊 Search by Yield Range")
-    print("7. 🔧 Search by Consumable Type (toner/drum)")
-    print("8. 📋 List All Items")
-    print("9. ➕ Add New Item")
-    print("10. 📥 Import from Text")
-    print("11. 📤 Export to JSON")
-    print("12. 📊 Show Statistics")
-    print("0. 🚪 Exit")
-    print("-" * 50)
-
-
-def show_statistics():
+    sys.stdout.write(_MENU)
+    sys.stdout.flush()
+
+
+def show_statistics(data=None):
     """Display database statistics"""
-    data = load_data()
+    if data is None:
+        data = load_data()
 
     if not data:
         print("Database is empty.")
         return
 
-    # Count by color and consumable type
-    colors = {}
-    consumable_types = {}
+    # Count everything in a single pass
+    colors = Counter()
+    consumable_types = Counter()
+    chip_counter = Counter()
     models = set()
     regions = set()
-    yields = []
-    chip_types = set()
+    yield_count = 0
+    sum_yield = 0
+    min_yield = None
+    max_yield = None
 
     for item in data:
-        color = item.get("color", "Unknown")
-        colors[color] = colors.get(color, 0) + 1
-
-        ctype = item.get("consumable_type", "Unknown")
-        consumable_types[ctype] = consumable_types.get(ctype, 0) + 1
+        colors[item.get("color", "Unknown")] += 1
+        consumable_types[item.get("consumable_type", "Unknown")] += 1
 
         models.add(item.get("printer_model", ""))
         if item.get("region_zone"):
             regions.add(item.get("region_zone"))
-        if item.get("yield"):
-            try:
-                yield_val = int(str(item.get("yield")).replace(",", ""))
-                yields.append(yield_val)
-            except (ValueError, TypeError):
-                pass
+        yield_val = parse_yield_value(item.get("yield"))
+        if yield_val is not None:
+            yield_count += 1
+            sum_yield += yield_val
+            if min_yield is None or yield_val < min_yield:
+                min_yield = yield_val
+            if max_yield is None or yield_val > max_yield:
+                max_yield = yield_val
         if item.get("chip_type"):
-            chip_types.add(item.get("chip_type"))
+            chip_counter[item.get("chip_type")] += 1
 
     print("\n📊 Database Statistics")
     print("=" * 40)
     print(f"Total Items: {len(data)}")
     print(f"Unique Printer Models: {len(models)}")
     print(f"Regions/Zones: {len(regions)}")
-    print(f"Chip Types: {len(chip_types)}")
+    print(f"Chip Types: {len(chip_counter)}")
 
-    if yields:
+    if yield_count:
         print(f"\n📊 Yield Statistics:")
-        print(f"  Average Yield: {sum(yields) // len(yields):,} pages")
-        print(f"  Min Yield: {min(yields):,} pages")
-        print(f"  Max Yield: {max(yields):,} pages")
+        print(f"  Average Yield: {sum_yield // yield_count:,} pages")
+        print(f"  Min Yield: {min_yield:,} pages")
+        print(f"  Max Yield: {max_yield:,} pages")
 
     print("\n🎨 By Color/Drum Type:")
     for color, count in colors.items():
@@ -602,10 +738,9 @@ def show_statistics():
     for ctype, count in consumable_types.items():
         print(f"  {ctype}: {count} items")
     
-    if chip_types:
+    if chip_counter:
         print(f"\n💾 Chip Types:")
-        for chip in sorted(chip_types):
-            count = sum(1 for item in data if item.get("chip_type") == chip)
+        for chip, count in sorted(chip_counter.items()):
             print(f"  {chip}: {count} items")
 
 
@@ -727,36 +862,28 @@ Examples:
         interactive_mode()
         return
 
-    if args.search_model:
-        results = search_data("model", args.search_model)
-        display_results_clustered(results)
-
-    if args.search_part:
-        results = search_data("part", args.search_part)
-        display_results_simple(results)
-
-    if args.search_color:
-        results = search_data("color", args.search_color)
-        display_results_clustered(results)
-
-    if args.search_iot:
-        results = search_data("iot", args.search_iot)
-        display_results_clustered(results)
-
-    if args.search_region:
-        results = search_data("region", args.search_region)
-        display_results_clustered(results)
-
-    if args.search_yield:
-        results = search_data("yield", args.search_yield)
-        display_results_clustered(results)
-
-    if args.search_type:
-        results = search_data("consumable_type", args.search_type)
-        display_results_clustered(results)
+    # Run the requested searches in the order of the options above
+    searches = [
+        (args.search_model, "model", display_results_clustered),
+        (args.search_part, "part", display_results_simple),
+        (args.search_color, "color", display_results_clustered),
+        (args.search_iot, "iot", display_results_clustered),
+        (args.search_region, "region", display_results_clustered),
+        (args.search_yield, "yield", display_results_clustered),
+        (args.search_type, "consumable_type", display_results_clustered),
+    ]
+    searches = [(query, search_type, display) for query, search_type, display in searches if query]
+
+    # Load the database once for all handlers that only read it
+    data = None
+    if searches or args.list_all or args.export_json or args.stats:
+        data = load_data()
+
+    for query, search_type, display in searches:
+        display(search_data(search_type, query, data))
 
     if args.list_all:
-        list_all()
+        list_all(data)
 
     if args.add_item:
         add_item()
@@ -764,11 +891,15 @@ Examples:
     if args.import_text:
         import_from_text()
 
+    if data is not None and (args.add_item or args.import_text):
+        # Pick up the items that were just saved
+        data = load_data()
+
     if args.export_json:
-        export_to_json()
+        export_to_json(data)
 
     if args.stats:
-        show_statistics()
+        show_statistics(data)
 
 
 def main():
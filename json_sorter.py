@@ -8,13 +8,75 @@ import json
 import argparse
 import sys
 import os
-from typing import List, Dict, Any, Union, Optional
+from functools import lru_cache
+from typing import Callable, List, Dict, Any, Union, Optional
+
+import fast_json
+
+# numpy sorts purely numeric keys in C; without it every sort goes
+# through the regular Python path
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Below this many items the Python sort is faster than going through numpy
+NUMPY_SORT_MIN_ITEMS = 5000
+
+# Sort values for None and missing keys: before or after every real value
+_NEG_INF = float('-inf')
+_POS_INF = float('inf')
+
+class _Descending:
+    """Sort key wrapper that inverts the ordering of the wrapped value"""
+    __slots__ = ('value',)
+    
+    def __init__(self, value: Any):
+        self.value = value
+    
+    def __eq__(self, other: '_Descending') -> bool:
+        return self.value == other.value
+    
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.value < self.value
+
+def _numeric_sort_order(data: List[Dict], getters: List[Callable[[Dict], Any]], reverse_list: List[bool]):
+    """
+    Sort order for numeric sort keys using numpy.lexsort
+    
+    Returns None when a key is not purely numeric, or its values cannot be
+    compared exactly as int64/float64, so the caller falls back to sorted().
+    lexsort is stable, so ties keep their original order just like sorted().
+    """
+    columns = []
+    for get, is_reverse in zip(getters, reverse_list):
+        column = np.asarray([get(item) for item in data])
+        kind = column.dtype.kind
+        if kind == 'b':
+            column = column.astype(np.int8)
+        elif kind == 'i':
+            if is_reverse and column.min() == np.iinfo(column.dtype).min:
+                return None
+        elif kind == 'f':
+            if np.isnan(column).any():
+                return None
+            finite = column[np.isfinite(column)]
+            # Larger integers are not exact as float64
+            if finite.size and np.abs(finite).max() > 2 ** 53:
+                return None
+        else:
+            return None
+        columns.append(-column if is_reverse else column)
+    
+    # lexsort treats its last key as the primary one
+    return np.lexsort(columns[::-1])
 
 def sort_json_data(
     data: Union[str, List[Dict], Dict],
     sort_keys: List[str],
     reverse: Union[bool, List[bool]] = False,
-    missing_key_strategy: str = 'last'
+    missing_key_strategy: str = 'last',
+    in_place: bool = False
 ) -> Any:
     """
     Sort JSON data by multiple keys
@@ -24,6 +86,8 @@ def sort_json_data(
         sort_keys: List of keys to sort by (in priority order)
         reverse: True for descending, or list of bools per key
         missing_key_strategy: How to handle missing keys ('first', 'last', 'error')
+        in_place: Sort a list passed in as data in place instead of
+            building a new one (saves a copy of the list on large inputs)
     
     Returns:
         Sorted JSON data
@@ -34,7 +98,7 @@ def sort_json_data(
         for key, value in data.items():
             if isinstance(value, list):
                 # Sort the list and keep the dictionary structure
-                sorted_list = sort_json_data(value, sort_keys, reverse, missing_key_strategy)
+                sorted_list = sort_json_data(value, sort_keys, reverse, missing_key_strategy, in_place)
                 return {key: sorted_list}
     
     # If data is a single dictionary (not a list), wrap it in a list
@@ -57,42 +121,93 @@ def sort_json_data(
         if len(reverse_list) != len(sort_keys):
             raise ValueError("Length of reverse list must match number of sort keys")
     
-    # Create sort key function
-    def get_sort_value(item: Dict, key: str, is_reverse: bool) -> Any:
-        """Get value for sorting with missing key handling"""
-        if key not in item:
-            if missing_key_strategy == 'error':
-                raise KeyError(f"Key '{key}' not found in item")
-            elif missing_key_strategy == 'first':
-                return float('-inf') if not is_reverse else float('inf')
-            elif missing_key_strategy == 'last':
-                return float('inf') if not is_reverse else float('-inf')
+    def make_getter(key: str, is_reverse: bool) -> Callable[[Dict], Any]:
+        """Build the value getter for one sort key
         
-        value = item[key]
+        The missing-key strategy and sort direction are resolved here, once
+        per key, so the returned getter does no strategy checks per item.
+        """
+        # Value used for None (and, with 'first', for missing keys)
+        none_value = _NEG_INF if not is_reverse else _POS_INF
+        
+        if '.' in key:
+            # Nested keys are read straight from the original item; a
+            # missing path sorts like a None value
+            walk = _compile_path(key)
+            
+            def get_nested(item: Dict) -> Any:
+                try:
+                    value = walk(item)
+                except (KeyError, TypeError):
+                    return none_value
+                return none_value if value is None else value
+            return get_nested
+        
+        if missing_key_strategy == 'error':
+            def get_required(item: Dict) -> Any:
+                try:
+                    value = item[key]
+                except KeyError:
+                    raise KeyError(f"Key '{key}' not found in item") from None
+                return none_value if value is None else value
+            return get_required
         
-        # Handle None values
-        if value is None:
-            return float('-inf') if not is_reverse else float('inf')
+        missing_value = none_value if missing_key_strategy == 'first' else (_POS_INF if not is_reverse else _NEG_INF)
         
-        return value
+        def get_value(item: Dict) -> Any:
+            value = item.get(key, missing_value)
+            return none_value if value is None else value
+        return get_value
+    
+    getters = [make_getter(key, rev) for key, rev in zip(sort_keys, reverse_list)]
+    
+    # Purely numeric keys on larger inputs: let numpy do the sorting. The
+    # first item is probed so string keys skip this path straight away.
+    if (
+        np is not None
+        and sort_keys
+        and len(data) >= NUMPY_SORT_MIN_ITEMS
+        and all(type(get(data[0])) in (int, float, bool) for get in getters)
+    ):
+        order = _numeric_sort_order(data, getters, reverse_list)
+        if order is not None:
+            sorted_data = [data[i] for i in order.tolist()]
+            if in_place:
+                data[:] = sorted_data
+                return data
+            return sorted_data
+    
+    # sorted() computes each item's key once up front, so the key tuples
+    # are only built N times. When every key sorts in the same direction,
+    # reverse=True handles descending order; mixed directions wrap the
+    # descending columns so a single sort still suffices.
+    all_reverse = all(reverse_list)
+    if any(reverse_list) and not all_reverse:
+        getters = [
+            (lambda item, get=get: _Descending(get(item))) if rev else get
+            for get, rev in zip(getters, reverse_list)
+        ]
     
     def sort_key(item: Dict) -> tuple:
         """Create tuple for multi-key sorting"""
-        return tuple(
-            get_sort_value(item, key, rev)
-            for key, rev in zip(sort_keys, reverse_list)
-        )
+        return tuple([get(item) for get in getters])
+    
+    # A single key needs no tuple around its value
+    key_func = getters[0] if len(getters) == 1 else sort_key
     
     # Sort the data
-    sorted_data = sorted(data, key=sort_key)
+    if in_place:
+        data.sort(key=key_func, reverse=all_reverse and bool(sort_keys))
+        return data
+    
+    sorted_data = sorted(data, key=key_func, reverse=all_reverse and bool(sort_keys))
     
     return sorted_data
 
 def load_json_file(file_path: str) -> Any:
     """Load JSON data from file"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return fast_json.load_file(file_path)
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found.", file=sys.stderr)
         sys.exit(1)
@@ -103,8 +218,8 @@ def load_json_file(file_path: str) -> Any:
 def save_json_file(data: Any, file_path: str, indent: Optional[int] = 2) -> None:
     """Save JSON data to file"""
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=indent, ensure_ascii=False)
+        with open(file_path, 'wb') as f:
+            f.write(fast_json.dumps(data, indent))
         print(f"✓ Successfully saved sorted JSON to '{file_path}'")
     except IOError as e:
         print(f"Error: Could not write to '{file_path}': {e}", file=sys.stderr)
@@ -154,34 +269,20 @@ Examples:
     
     return parser.parse_args()
 
-def get_nested_value(item: Dict, key_path: str) -> Any:
-    """Get value from nested dictionary using dot notation"""
-    keys = key_path.split('.')
-    value = item
-    for key in keys:
-        if isinstance(value, dict) and key in value:
-            value = value[key]
-        else:
-            raise KeyError(f"Key '{key}' not found in path '{key_path}'")
-    return value
-
-def prepare_data_with_nested_keys(data: List[Dict], sort_keys: List[str]) -> List[Dict]:
-    """Flatten nested keys for sorting"""
-    prepared_data = []
-    
-    for item in data:
-        flat_item = item.copy()
-        for key_path in sort_keys:
-            if '.' in key_path:
-                # Extract nested value and add to flat item
-                try:
-                    value = get_nested_value(item, key_path)
-                    flat_item[key_path] = value
-                except KeyError:
-                    flat_item[key_path] = None
-        prepared_data.append(flat_item)
+@lru_cache(maxsize=256)
+def _compile_path(key_path: str) -> Callable[[Dict], Any]:
+    """
+    Compile a dotted key path into an accessor function
     
-    return prepared_data
+    "user.name" becomes the equivalent of `lambda d: d['user']['name']`,
+    so walking the path is a chain of subscripts with no Python-level
+    loop. The accessor raises KeyError or TypeError when the path does
+    not exist in the item.
+    """
+    source = "def walk(d):\n    return d" + "".join(f"[{part!r}]" for part in key_path.split('.')) + "\n"
+    namespace: Dict[str, Any] = {}
+    exec(source, namespace)
+    return namespace['walk']
 
 def main():
     """Main function"""
@@ -202,17 +303,6 @@ def main():
     # Check if data is a list
     original_is_dict = isinstance(data, dict) and not isinstance(data, list)
     
-    # Handle nested keys by flattening
-    has_nested_keys = any('.' in key for key in args.keys)
-    
-    if has_nested_keys and isinstance(data, list):
-        # Prepare data with flattened nested keys
-        data_to_sort = prepare_data_with_nested_keys(data, args.keys)
-        sort_keys = args.keys  # Use the same keys (now they exist in flattened data)
-    else:
-        data_to_sort = data
-        sort_keys = args.keys
-    
     # Parse reverse argument
     if args.reverse:
         if len(args.reverse) == 1:
@@ -236,21 +326,13 @@ def main():
     try:
         # Sort the data
         sorted_data = sort_json_data(
-            data=data_to_sort,
-            sort_keys=sort_keys,
+            data=data,
+            sort_keys=args.keys,
             reverse=reverse_arg,
-            missing_key_strategy=args.missing_key
+            missing_key_strategy=args.missing_key,
+            in_place=True
         )
         
-        # If we flattened for nested keys, restore original structure
-        if has_nested_keys and isinstance(data, list) and isinstance(sorted_data, list):
-            # Remove the flattened keys we added
-            restored_data = []
-            for item in sorted_data:
-                original_item = {k: v for k, v in item.items() if k not in args.keys or '.' not in k}
-                restored_data.append(original_item)
-            sorted_data = restored_data
-        
         # If original was a single dict, extract it
         if original_is_dict and isinstance(sorted_data, list) and len(sorted_data) == 1:
             sorted_data = sorted_data[0]
@@ -264,15 +346,12 @@ def main():
         print("\n" + "="*50)
         print("SORTED DATA PREVIEW:")
         print("="*50)
-        preview = json.dumps(
-            sorted_data[:3] if isinstance(sorted_data, list) and len(sorted_data) > 3 else sorted_data,
-            indent=2,
-            ensure_ascii=False
-        )
-        print(preview)
+        item_count = len(sorted_data) if isinstance(sorted_data, list) else 0
+        preview = fast_json.dumps(sorted_data[:3] if item_count > 3 else sorted_data)
+        print(preview.decode('utf-8'))
         
-        if isinstance(sorted_data, list) and len(sorted_data) > 3:
-            print(f"\n... and {len(sorted_data) - 3} more items")
+        if item_count > 3:
+            print(f"\n... and {item_count - 3} more items")
     
     # Save or show message
     if args.dry_run:
@@ -8,6 +8,8 @@ import json
 import sys
 import os
 
+import fast_json
+
 # Template structure with all required fields
 TEMPLATE_STRUCTURE = {
     "part_number": "",
@@ -21,6 +23,9 @@ TEMPLATE_STRUCTURE = {
     "chip_type": ""
 }
 
+# Template field names, to check source objects against in one set operation
+TEMPLATE_KEYS = frozenset(TEMPLATE_STRUCTURE)
+
 def merge_json(source_file, output_file):
     """
     Merge source JSON into the complete template structure
@@ -28,29 +33,28 @@ def merge_json(source_file, output_file):
     """
     try:
         # Read source JSON
-        with open(source_file, 'r', encoding='utf-8') as f:
-            source_data = json.load(f)
-        
-        results = []
+        source_data = fast_json.load_file(source_file)
         
         # Handle different types of input
         if isinstance(source_data, dict):
             # Single object
-            results.append(process_single_object(source_data))
+            results = [process_single_object(source_data)]
         elif isinstance(source_data, list):
             # Array of objects
-            for index, item in enumerate(source_data):
-                if isinstance(item, dict):
-                    results.append(process_single_object(item))
-                else:
-                    print(f"⚠️ Warning: Skipping item at index {index} - not an object")
+            process = process_single_object
+            results = [process(item) for item in source_data if isinstance(item, dict)]
+            
+            # Only look for the skipped items when there are any
+            if len(results) != len(source_data):
+                for index, item in enumerate(source_data):
+                    if not isinstance(item, dict):
+                        print(f"⚠️ Warning: Skipping item at index {index} - not an object")
         else:
             print(f"❌ Error: Source JSON must be an object or array of objects, got {type(source_data)}")
             return False
         
         # Write to output file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2)
+        fast_json.save_json_array_streaming(output_file, results)
         
         print(f"✅ Successfully processed {source_file} -> {output_file}")
         print(f"📊 Processed {len(results)} item(s)")
@@ -59,7 +63,7 @@ def merge_json(source_file, output_file):
         print(f"\n📋 Preview (first 2 items):")
         for i, item in enumerate(results[:2]):
             print(f"\nItem {i + 1}:")
-            print(json.dumps(item, indent=2))
+            print(fast_json.dumps(item).decode('utf-8'))
         
         if len(results) > 2:
             print(f"\n... and {len(results) - 2} more item(s)")
@@ -82,6 +86,11 @@ def process_single_object(source_obj):
     """
     Process a single JSON object
     """
+    # Objects with only template fields (the usual case) are overlaid on
+    # the template in one go; the key order stays that of the template
+    if TEMPLATE_KEYS.issuperset(source_obj):
+        return {**TEMPLATE_STRUCTURE, **source_obj}
+    
     # Create result based on template
     result = TEMPLATE_STRUCTURE.copy()
     
@@ -1,12 +1,32 @@
+import codecs
+import contextlib
+import io
 import json
+import os
+import re
 import sys
-from typing import Dict, List, Any, Union
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Any, Iterable, Iterator, Union
+
+import fast_json
+
+# Read size for load_json_stream
+STREAM_CHUNK_SIZE = 1 << 20
+# Read size for is_json_array_file
+HEAD_READ_SIZE = 64
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Characters a JSON number may still continue with
+_NUMBER_TAIL = re.compile(r'[0-9.eE+\-]*\Z')
+# Longest token tail a chunk boundary can cut off without the decoder
+# reaching the end of the buffer (a split surrogate pair escape)
+_MAX_PARTIAL_TOKEN = 12
 
 def load_json_file(filepath: str) -> Union[List[Dict[str, Any]], Dict[str, Any], None]:
     """Load JSON data from file."""
     try:
-        with open(filepath, 'r', encoding='utf-8') as file:
-            return json.load(file)
+        return fast_json.load_file(filepath)
     except FileNotFoundError:
         print(f"Error: File '{filepath}' not found.")
         return None
@@ -17,16 +37,142 @@ def load_json_file(filepath: str) -> Union[List[Dict[str, Any]], Dict[str, Any],
         print(f"Error loading file '{filepath}': {e}")
         return None
 
+def is_json_array_file(filepath: str) -> bool:
+    """Check whether a JSON file holds a top-level array."""
+    try:
+        with open(filepath, 'rb') as file:
+            # Only the first non-whitespace byte matters
+            while True:
+                head = file.read(HEAD_READ_SIZE)
+                if not head:
+                    return False
+                head = head.lstrip()
+                if head:
+                    return head[:1] == b'['
+    except OSError:
+        return False
+
+def load_json_stream(filepath: str) -> Iterator[Any]:
+    """
+    Yield the items of a top-level JSON array one at a time.
+    
+    The file is read in chunks and only the item being decoded is kept in
+    memory, so arrays larger than RAM can be processed.
+    Raises json.JSONDecodeError on malformed input.
+    """
+    decoder = json.JSONDecoder()
+    decode = codecs.getincrementaldecoder('utf-8')().decode
+    
+    with open(filepath, 'rb') as file:
+        buf = ''
+        pos = 0
+        eof = False
+        # Characters and lines dropped from the front of buf so far, and the
+        # file position where the line at the start of buf begins
+        consumed = 0
+        consumed_lines = 0
+        line_start = 0
+        
+        def read_more():
+            nonlocal buf, pos, eof, consumed, consumed_lines, line_start
+            newlines = buf.count('\n', 0, pos)
+            if newlines:
+                consumed_lines += newlines
+                line_start = consumed + buf.rfind('\n', 0, pos) + 1
+            consumed += pos
+            chunk = file.read(STREAM_CHUNK_SIZE)
+            eof = not chunk
+            buf = buf[pos:] + decode(chunk, final=eof)
+            pos = 0
+        
+        def error(msg: str, at: int) -> json.JSONDecodeError:
+            """Build a JSONDecodeError for buf[at] with line, column and char in the file."""
+            err = json.JSONDecodeError(msg, buf, at)
+            err.pos = consumed + at
+            newlines = buf.count('\n', 0, at)
+            err.lineno = consumed_lines + newlines + 1
+            err.colno = at - buf.rfind('\n', 0, at) if newlines else err.pos - line_start + 1
+            err.args = (f"{msg}: line {err.lineno} column {err.colno} (char {err.pos})",)
+            return err
+        
+        def next_char() -> str:
+            """Skip whitespace and return the next character ('' at the end)."""
+            nonlocal pos
+            while True:
+                pos = _WHITESPACE.match(buf, pos).end()
+                if pos < len(buf) or eof:
+                    return buf[pos:pos + 1]
+                read_more()
+        
+        if next_char() != '[':
+            raise error("Expecting '['", pos)
+        pos += 1
+        
+        if next_char() == ']':
+            pos += 1
+        else:
+            while True:
+                next_char()
+                while True:
+                    try:
+                        item, end = decoder.raw_decode(buf, pos)
+                    except json.JSONDecodeError as e:
+                        # The item may continue in the next chunk, but only if
+                        # the decoder ran into the end of the buffer. Anything
+                        # earlier is malformed and more data won't fix it.
+                        if eof or not (e.msg.startswith('Unterminated string')
+                                       or len(buf) - e.pos <= _MAX_PARTIAL_TOKEN):
+                            raise error(e.msg, e.pos) from None
+                        read_more()
+                        continue
+                    if not eof and _NUMBER_TAIL.match(buf, end):
+                        # Nothing but (part of) a number left - it may continue
+                        read_more()
+                        continue
+                    break
+                pos = end
+                yield item
+                
+                char = next_char()
+                if char == ',':
+                    pos += 1
+                elif char == ']':
+                    pos += 1
+                    break
+                else:
+                    raise error("Expecting ',' delimiter", pos)
+        
+        if next_char():
+            raise error("Extra data", pos)
+
 def save_json_file(filepath: str, data: Union[List[Dict[str, Any]], Dict[str, Any]]) -> bool:
     """Save JSON data to file."""
     try:
-        with open(filepath, 'w', encoding='utf-8') as file:
-            json.dump(data, file, indent=2, ensure_ascii=False)
+        if isinstance(data, list):
+            # Serialize one item at a time instead of one document-sized buffer
+            fast_json.save_json_array_streaming(filepath, data)
+            return True
+        with open(filepath, 'wb') as file:
+            file.write(fast_json.dumps(data))
         return True
     except Exception as e:
         print(f"Error saving file '{filepath}': {e}")
         return False
 
+def update_matching_item(item: Any, target_model: str, field_updates: Dict[str, str]) -> bool:
+    """
+    Apply field_updates in place if item is an exact printer_model match.
+    
+    Only fields the item already has are updated. Returns whether the
+    item matched.
+    """
+    if not isinstance(item, dict) or item.get("printer_model") != target_model:
+        return False
+    for field, new_value in field_updates.items():
+        if field in item:
+            item[field] = new_value
+    return True
+
 def find_and_update_printer_models(
     data: Union[List[Dict[str, Any]], Dict[str, Any]], 
     target_model: str,
@@ -35,6 +181,9 @@ def find_and_update_printer_models(
     """
     Find all exact printer_model matches and update specified fields.
     
+    Matching items are updated in place and the same data object is
+    returned; nothing is copied.
+    
     Args:
         data: JSON data (could be list, dict, or single object)
         target_model: Exact printer_model string to match
@@ -49,38 +198,45 @@ def find_and_update_printer_models(
     # Handle different data structures
     if isinstance(data, dict):
         # Single dictionary
-        if data.get("printer_model") == target_model:
-            for field, new_value in field_updates.items():
-                if field in data:
-                    data[field] = new_value
+        update_matching_item(data, target_model, field_updates)
         return data
     
     elif isinstance(data, list):
         # List of dictionaries
-        updated_data = []
         matches_found = 0
         
         for item in data:
-            if isinstance(item, dict) and item.get("printer_model") == target_model:
-                # Create a copy to avoid modifying the original
-                updated_item = item.copy()
-                for field, new_value in field_updates.items():
-                    if field in updated_item:
-                        updated_item[field] = new_value
-                updated_data.append(updated_item)
+            if update_matching_item(item, target_model, field_updates):
                 matches_found += 1
-            else:
-                # Keep non-matching items unchanged
-                updated_data.append(item)
         
         print(f"Found {matches_found} exact match(es) for printer model: '{target_model}'")
-        return updated_data
+        return data
     
     else:
         # Unsupported data type
         print(f"Warning: Unsupported data type: {type(data)}. Returning data unchanged.")
         return data
 
+def update_printer_models_stream(
+    items: Iterable[Any],
+    target_model: str,
+    field_updates: Dict[str, str]
+) -> Iterator[Any]:
+    """
+    Streaming version of find_and_update_printer_models for arrays.
+    
+    Yields each item, with field_updates applied in place to exact
+    printer_model matches, and reports the number of matches at the end.
+    """
+    matches_found = 0
+    
+    for item in items:
+        if update_matching_item(item, target_model, field_updates):
+            matches_found += 1
+        yield item
+    
+    print(f"Found {matches_found} exact match(es) for printer model: '{target_model}'")
+
 def get_field_updates_from_user() -> Dict[str, str]:
     """Get field updates from user input."""
     field_updates = {}
@@ -176,6 +332,47 @@ def process_json_file():
     
     print("\nDone!")
 
+def update_file(filepath: str, target_model: str, field_updates: Dict[str, str]) -> None:
+    """Apply the batch updates to one file and save it with an "_updated" suffix."""
+    print(f"\n{'='*50}")
+    print(f"Processing: {filepath}")
+    
+    # Save with "_updated" suffix
+    base_name, ext = filepath.rsplit('.', 1) if '.' in filepath else (filepath, 'json')
+    output_file = f"{base_name}_updated.{ext}"
+    
+    # Arrays are streamed item by item instead of loaded whole
+    if is_json_array_file(filepath):
+        try:
+            updated_items = update_printer_models_stream(
+                load_json_stream(filepath), target_model, field_updates
+            )
+            fast_json.save_json_array_streaming(output_file, updated_items)
+        except json.JSONDecodeError as e:
+            print(f"Error: Invalid JSON in file '{filepath}': {e}")
+            return
+        except Exception as e:
+            print(f"Error processing file '{filepath}': {e}")
+            return
+        print(f"Saved updated data to: {output_file}")
+        return
+    
+    data = load_json_file(filepath)
+    if data is None:
+        return
+    
+    updated_data = find_and_update_printer_models(data, target_model, field_updates)
+    
+    if save_json_file(output_file, updated_data):
+        print(f"Saved updated data to: {output_file}")
+
+def update_file_worker(filepath: str, target_model: str, field_updates: Dict[str, str]) -> str:
+    """Run update_file in a worker process and return what it printed."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        update_file(filepath, target_model, field_updates)
+    return output.getvalue()
+
 def batch_process_files():
     """Process multiple JSON files with the same updates."""
     print("=== Batch JSON Processor ===\n")
@@ -199,23 +396,16 @@ def batch_process_files():
         print("No fields specified for update. Exiting.")
         return
     
-    # Process each file
-    for filepath in file_paths:
-        print(f"\n{'='*50}")
-        print(f"Processing: {filepath}")
-        
-        data = load_json_file(filepath)
-        if data is None:
-            continue
-        
-        updated_data = find_and_update_printer_models(data, target_model, field_updates)
-        
-        # Save with "_updated" suffix
-        base_name, ext = filepath.rsplit('.', 1) if '.' in filepath else (filepath, 'json')
-        output_file = f"{base_name}_updated.{ext}"
-        
-        if save_json_file(output_file, updated_data):
-            print(f"Saved updated data to: {output_file}")
+    if len(file_paths) == 1:
+        update_file(file_paths[0], target_model, field_updates)
+        return
+    
+    # Files are independent - process them in parallel worker processes and
+    # print each file's output in the original order
+    max_workers = min(len(file_paths), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for output in executor.map(update_file_worker, file_paths, repeat(target_model), repeat(field_updates)):
+            sys.stdout.write(output)
 
 if __name__ == "__main__":
     print("JSON Printer Model Updater")